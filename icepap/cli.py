@@ -1,5 +1,7 @@
 import shutil
 import threading
+import functools
+import contextlib
 import collections
 
 import click
@@ -21,8 +23,6 @@ from .tools import (
     interrupt_myself,
     is_moving,
     calc_deltas,
-    gen_move,
-    gen_rmove,
     gen_motion,
     gen_rate_limiter)
 
@@ -30,6 +30,29 @@ from .tools import (
 # Progress bar stuff
 
 
+@functools.lru_cache(maxsize=None)
+def html_template(template):
+    """HTML object for the given template, parsed only once"""
+    return HTML(template)
+
+
+@functools.lru_cache(maxsize=64)
+def pos_formatter(pos_format, width):
+    """format function for a position with the given format and width"""
+    return "{{:{}}}".format(pos_format.format(width=width)).format
+
+
+@functools.lru_cache(maxsize=64)
+def max_pos_width(pos_format, positions):
+    """
+    width of the widest of the given positions. Initial and final positions
+    only change when a new motion starts so this is computed once per motion
+    instead of on every frame
+    """
+    fmt = pos_formatter(pos_format, '')
+    return max(len(fmt(position)) for position in positions)
+
+
 class Position(Formatter):
 
     moving = "<moving>{}</moving>"
@@ -39,16 +62,15 @@ class Position(Formatter):
     def format(self, progress_bar, progress, width):
         state = progress.state
         template = self.moving if state.is_moving() else self.stopped
-        fmt = "{{:{}}}".format(self.pos_format.format(width=width)).format
-        pos = fmt(progress.position)
-        return HTML(template).format(pos)
+        pos = pos_formatter(self.pos_format, width)(progress.position)
+        return html_template(template).format(pos)
 
     def get_width(self, progress_bar):
-        fmt = "{{:{}}}".format(self.pos_format.format(width='')).format
-        lengths = [len(fmt(c.initial_position)) for c in progress_bar.counters]
-        lengths += [len(fmt(c.final_position)) for c in progress_bar.counters]
+        counters = progress_bar.counters
+        positions = tuple(c.initial_position for c in counters)
+        positions += tuple(c.final_position for c in counters)
         # +2 to account for - sign and space
-        return D.exact(max(lengths) + 2)
+        return D.exact(max_pos_width(self.pos_format, positions) + 2)
 
 
 class InitialPosition(Formatter):
@@ -56,13 +78,11 @@ class InitialPosition(Formatter):
     pos_format = ">{width}g"
 
     def format(self, progress_bar, progress, width):
-        fmt = "{{:{}}}".format(self.pos_format.format(width=width)).format
-        return fmt(progress.initial_position)
+        return pos_formatter(self.pos_format, width)(progress.initial_position)
 
     def get_width(self, progress_bar):
-        fmt = "{{:{}}}".format(self.pos_format.format(width='')).format
-        lengths = (len(fmt(c.initial_position)) for c in progress_bar.counters)
-        return D.exact(max(lengths))
+        positions = tuple(c.initial_position for c in progress_bar.counters)
+        return D.exact(max_pos_width(self.pos_format, positions))
 
 
 class TargetPosition(Formatter):
@@ -70,13 +90,11 @@ class TargetPosition(Formatter):
     pos_format = ">{width}g"
 
     def format(self, progress_bar, progress, width):
-        fmt = "{{:{}}}".format(self.pos_format.format(width=width)).format
-        return fmt(progress.final_position)
+        return pos_formatter(self.pos_format, width)(progress.final_position)
 
     def get_width(self, progress_bar):
-        fmt = "{{:{}}}".format(self.pos_format.format(width='')).format
-        lengths = (len(fmt(c.final_position)) for c in progress_bar.counters)
-        return D.exact(max(lengths))
+        positions = tuple(c.final_position for c in progress_bar.counters)
+        return D.exact(max_pos_width(self.pos_format, positions))
 
 
 DEFAULT_FORMATTERS = [
@@ -146,12 +164,16 @@ Motion = collections.namedtuple(
     "group start_states start_positions initial_positions final_positions")
 
 
+def noop(*args):
+    pass
+
+
 class MotionHandler:
 
     def __init__(self, on_ok=None, on_error=None, always=None):
-        self.on_ok = on_ok or (lambda: None)
-        self.on_error = on_error or (lambda err: None)
-        self.always = always or (lambda: None)
+        self.on_ok = noop if on_ok is None else on_ok
+        self.on_error = noop if on_error is None else on_error
+        self.always = noop if always is None else always
 
     def __enter__(self):
         return self
@@ -168,22 +190,36 @@ def MotionProgressBar(motion, bar_options=None):
 
     def prepare_counter(counter):
         def update(state, position):
+            if position == counter.position and counter.state is not None \
+                    and state.status_register == counter.state.status_register:
+                return False
             counter.state = state
             counter.position = position
             counter.items_completed = abs(position - counter.initial_position)
+            return True
 
         def reset(initial, final):
             counter.total = abs(final - initial)
             counter.initial_position = initial
             counter.final_position = final
+            if counter.position is not None:
+                counter.items_completed = abs(counter.position - initial)
+            # force the next update to be taken into account even if the
+            # motor didn't change (ex: stuck at a limit)
+            counter.state = None
 
+        counter.state = counter.position = None
         counter.update = update
         counter.reset = reset
 
     def update(states, positions):
+        changed = False
         for counter, state, pos in zip(prog_bar.counters, states, positions):
-            counter.update(state, pos)
-        prog_bar.invalidate()
+            changed = counter.update(state, pos) or changed
+        # nothing to repaint if no motor changed (ex: the final update
+        # after the motion loop already reported the stopped motors)
+        if changed:
+            prog_bar.invalidate()
 
     def reset(motion):
         args = (
@@ -212,126 +248,101 @@ def MotionProgressBar(motion, bar_options=None):
     return prog_bar
 
 
-def _move(group, final_positions, refresh_period=0.1, bar_options=None):
-    start_states = group.get_states()
-    start_positions = group.get_pos()
-    motion = Motion(
-        group, start_states, start_positions, start_positions, final_positions
-    )
+class MotionSession:
+    """
+    Displays the motion(s) of a group in a progress bar. Takes care of
+    powering the motors and, on error or Ctrl-C, of stopping them and
+    waiting for them to stop.
+
+    Since the session already ensures power, start the motions directly
+    (ex: group.start_move() + gen_motion()) instead of using
+    gen_move/gen_rmove, which would query the power state again for every
+    motion. If the power state is already known (ex: read in the same
+    snapshot as the initial states and positions) pass it as powers.
+    """
+
+    def __init__(self, motion, refresh_period=0.1, bar_options=None,
+                 powers=None):
+        self.group = motion.group
+        self.refresh_period = refresh_period
+        self.powers = powers
+        self.title = HTML("<preparing>Preparing...</preparing>")
+        # last states and positions read from the controller
+        self.states = motion.start_states
+        self.positions = motion.start_positions
+        bar_options = bar_options or {}
+        bar_options.setdefault("title", lambda: self.title)
+        self.prog_bar = MotionProgressBar(motion, bar_options=bar_options)
+
+    def loop(self, gen):
+        for states, positions in gen_rate_limiter(gen, self.refresh_period):
+            self.states, self.positions = states, positions
+            self.prog_bar.update(states, positions)
+            # don't wait for the rate limiter to find out the motion is over
+            if not is_moving(states):
+                break
 
-    def motion_loop(gen):
-        for states, positions in gen_rate_limiter(gen, refresh_period):
-            prog_bar.update(states, positions)
+    def run(self, gen):
+        self.title = HTML("<moving>Moving...</moving>")
+        self.loop(gen)
 
-    def on_ok():
-        nonlocal title
-        title = HTML("<done>Finished!</done>")
+    def on_ok(self):
+        self.title = HTML("<done>Finished!</done>")
 
-    def on_error(error):
-        nonlocal title
-        group.start_stop()
+    def on_error(self, error):
+        self.group.start_stop()
         kb = isinstance(error, KeyboardInterrupt)
         if kb:
             msg = "<ctrlc>Stopping... </ctrlc>"
         else:
-            msg = "<error>Motion error: {!r}<error>. ".format(error)
+            msg = "<error>Motion error: {!r}</error>. ".format(error)
             msg += "Waiting for motors to stop..."
-        title = HTML(msg)
-        motion_loop(gen_motion(group))
-        title = HTML(msg + "[<done>DONE</done>]")
-
-    def always_end_with():
-        prog_bar.update(group.get_states(), group.get_pos())
+        self.title = HTML(msg)
+        self.loop(gen_motion(self.group))
+        self.title = HTML(msg + "[<done>DONE</done>]")
 
-    title = HTML("<preparing>Preparing...</preparing>")
-    bar_options = bar_options or {}
-    bar_options.setdefault("title", lambda: title)
-    prog_bar = MotionProgressBar(motion, bar_options=bar_options)
-    power = ensure_power(group)
-    handler = MotionHandler(on_ok, on_error, always_end_with)
-    with prog_bar, power, handler:
-        title = HTML("<moving>Moving...</moving>")
-        motion_loop(gen_move(group, final_positions))
+    def always_end_with(self):
+        # the motion loops only end once all motors stopped: display the
+        # last states and positions they read instead of asking again
+        self.prog_bar.update(self.states, self.positions)
 
+    @contextlib.contextmanager
+    def running(self):
+        power = ensure_power(self.group, powers=self.powers)
+        handler = MotionHandler(
+            self.on_ok, self.on_error, self.always_end_with
+        )
+        with self.prog_bar, power, handler:
+            yield self
 
-def _rmove(group, deltas, refresh_period=0.1, bar_options=None):
-    start_states = group.get_states()
-    start_positions = group.get_pos()
-    final_positions = [p + d for p, d in zip(start_positions, deltas)]
-    motion = Motion(
-        group, start_states, start_positions, start_positions, final_positions
-    )
 
-    def motion_loop(gen):
-        for states, positions in gen_rate_limiter(gen, refresh_period):
-            prog_bar.update(states, positions)
-
-    def on_ok():
-        nonlocal title
-        title = HTML("<done>Finished!</done>")
-
-    def on_error(error):
-        nonlocal title
-        group.start_stop()
-        kb = isinstance(error, KeyboardInterrupt)
-        if kb:
-            msg = "<ctrlc>Stopping... </ctrlc>"
-        else:
-            msg = "<error>Motion error: {!r}<error>. ".format(error)
-            msg += "Waiting for motors to stop..."
-        title = HTML(msg)
-        motion_loop(gen_motion(group))
-        title = HTML(msg + "[<done>DONE</done>]")
+def _move(group, final_positions, refresh_period=0.1, bar_options=None):
+    snap = group.snapshot('states', 'pos', 'power')
+    motion = Motion(group, snap.states, snap.pos, snap.pos, final_positions)
+    session = MotionSession(motion, refresh_period, bar_options, snap.power)
+    with session.running():
+        group.start_move(final_positions)
+        session.run(gen_motion(group))
 
-    def always_end_with():
-        prog_bar.update(group.get_states(), group.get_pos())
 
-    title = HTML("<preparing>Preparing...</preparing>")
-    bar_options = bar_options or {}
-    bar_options.setdefault("title", lambda: title)
-    prog_bar = MotionProgressBar(motion, bar_options=bar_options)
-    power = ensure_power(group)
-    handler = MotionHandler(on_ok, on_error, always_end_with)
-    with prog_bar, power, handler:
-        title = HTML("<moving>Moving...</moving>")
-        motion_loop(gen_rmove(group, deltas))
+def _rmove(group, deltas, refresh_period=0.1, bar_options=None):
+    snap = group.snapshot('states', 'pos', 'power')
+    final_positions = [p + d for p, d in zip(snap.pos, deltas)]
+    motion = Motion(group, snap.states, snap.pos, snap.pos, final_positions)
+    session = MotionSession(motion, refresh_period, bar_options, snap.power)
+    with session.running():
+        group.start_rmove(deltas)
+        session.run(gen_motion(group))
 
 
 def _rmove_multiple(group, deltas, refresh_period=0.1, bar_options=None):
-    start_states = group.get_states()
-    start_positions = group.get_pos()
-    final_positions = [p + d for p, d in zip(start_positions, deltas)]
+    snap = group.snapshot('states', 'pos', 'power')
+    start_states = snap.states
+    final_positions = [p + d for p, d in zip(snap.pos, deltas)]
     dir_deltas = deltas
     rev_deltas = [-delta for delta in deltas]
-    motion = Motion(
-        group, start_states, start_positions, start_positions, final_positions
-    )
-
-    def motion_loop(gen):
-        for states, positions in gen_rate_limiter(gen, refresh_period):
-            prog_bar.update(states, positions)
-
-    def on_ok():
-        nonlocal title
-        title = HTML("<done>Finished!</done>")
-
-    def on_error(error):
-        nonlocal title
-        group.start_stop()
-        kb = isinstance(error, KeyboardInterrupt)
-        if kb:
-            msg = "<ctrlc>Stopping... </ctrlc>"
-        else:
-            msg = "<error>Motion error: {!r}</error>. ".format(error)
-            msg += "Waiting for motors to stop..."
-        title = HTML(msg)
-        motion_loop(gen_motion(group))
-        title = HTML(msg + "[<done>DONE</done>]")
-
-    def always_end_with():
-        prog_bar.update(group.get_states(), group.get_pos())
+    motion = Motion(group, start_states, snap.pos, snap.pos, final_positions)
 
-    title = HTML("<preparing>Preparing...</preparing>")
     bar_options = bar_options or {}
     evt = threading.Event()
     keys = create_default_key_bindings()
@@ -353,27 +364,26 @@ def _rmove_multiple(group, deltas, refresh_period=0.1, bar_options=None):
         " Press [<b>x</b>] or [<b>Ctrl-C</b>] Stop | "
         '[<a bg="deepskyblue">left arrow</a>] Move left | '
         '[<a bg="deepskyblue">right arrow</a>] Move right.')
-    bar_options.setdefault("title", lambda: title)
-    prog_bar = MotionProgressBar(motion, bar_options=bar_options)
-    power = ensure_power(group)
-    handler = MotionHandler(on_ok, on_error, always_end_with)
-    with prog_bar, power, handler:
+    session = MotionSession(motion, refresh_period, bar_options, snap.power)
+    with session.running():
         while True:
             evt.wait()
             evt.clear()
             if action == "stop":
                 break
             curr_deltas = dir_deltas if action == "right" else rev_deltas
-            start_pos = group.get_pos()
+            # the previous motion loop only ends once all motors stopped so
+            # its last positions are where this motion starts from
+            start_pos = session.positions
             final_pos = [p + d for p, d in zip(start_pos, curr_deltas)]
             motion = Motion(
                 group, start_states, start_pos, start_pos, final_pos
             )
-            prog_bar.reset(motion)
+            session.prog_bar.reset(motion)
             action = None
-            title = HTML("<moving>Moving...</moving>")
-            motion_loop(gen_rmove(group, curr_deltas))
-            title = HTML("<done>Finished!</done>")
+            group.start_rmove(curr_deltas)
+            session.run(gen_motion(group))
+            session.on_ok()
 
 # -----------------------------------------------------------------------------
 # Tables
@@ -383,6 +393,8 @@ def bool_text(data, false="NO", true="YES"):
     return true if data else false
 
 
+# tables repeat the same few colored cells over and over
+@functools.lru_cache(maxsize=64)
 def bool_text_color(data, text_false="NO", text_true="YES",
                     color_false="bright_red",
                     color_true="green"):
@@ -415,14 +427,15 @@ def StateTable(group, style=beautifultable.Style.STYLE_BOX_ROUNDED):
     table.columns.header = (
         "Axis", "Name", "Pos.", "Ready", "Alive", "Pres.", "Enab.",
         "Power", "5V", "Lim-", "Lim+", "Warn")
+    snap = group.snapshot('states', 'fpos')
     args = (
-        group.motors,
+        snap.axes,
         group.names,
-        group.get_states(),
-        group.get_fpos()
+        snap.states,
+        snap.fpos
     )
-    for motor, name, state, pos in zip(*args):
-        row = (motor.axis, name, pos,
+    for axis, name, state, pos in zip(*args):
+        row = (axis, name, pos,
                bool_text_color(state.is_ready()),
                bool_text_color(state.is_alive()),
                bool_text_color(state.is_present()),
@@ -439,10 +452,11 @@ def StateTable(group, style=beautifultable.Style.STYLE_BOX_ROUNDED):
 def StatusTable(group, style=beautifultable.Style.STYLE_BOX_ROUNDED):
     table = Table(style=style)
     table.columns.header = ('Axis', 'Name', 'Pos.', 'Ready', 'Vel.', 'Acc. T.')
-    args = (group.motors, group.names, group.get_states(), group.get_fpos(),
-            group.get_acctime(), group.get_velocity())
-    for motor, name, state, pos, acctime, velocity in zip(*args):
-        row = (motor.axis, name, pos,
+    snap = group.snapshot('states', 'fpos', 'acctime', 'velocity')
+    args = (snap.axes, group.names, snap.states, snap.fpos,
+            snap.acctime, snap.velocity)
+    for axis, name, state, pos, acctime, velocity in zip(*args):
+        row = (axis, name, pos,
                bool_text_color(state.is_ready()), velocity, acctime)
         table.rows.append(row)
     return table
@@ -455,7 +469,7 @@ def PositionTable(group, style=beautifultable.Style.STYLE_BOX_ROUNDED):
     table.columns.header = header
     cols = [
         ctrl.get_pos(axes, register=register)
-        for i, register in enumerate(header[1:])
+        for register in header[1:]
     ]
     for row in zip(axes, *cols):
         table.rows.append(row)
@@ -133,11 +133,11 @@ class IcePAPCommunication:
         str_startmark = struct.pack('L', startmark)[:4]
         str_nworddata = struct.pack('L', nworddata)[:4]
         str_maskedchksum = struct.pack('L', maskedchksum)[:4]
-        str_data = data.tobytes()
-        str_bin = str_startmark + str_nworddata + str_maskedchksum + str_data
-        str_bin += b'\r'
 
-        self._sock.write(str_bin)
+        # scatter write: avoids copying the (potentially large) data into
+        # a single bytes object together with the header
+        self._sock.write_many([str_startmark, str_nworddata,
+                               str_maskedchksum, data, b'\r'])
 
     def disconnect(self):
         """
@@ -120,10 +120,7 @@ class IcePAPController:
         elif isinstance(alias, IcePAPAxis):
             result = str(alias.axis)
         elif isinstance(alias, list):
-            result = []
-            for i in alias:
-                result.append(self._alias2axisstr(i))
-            result = ' '.join(result)
+            result = ' '.join([self._alias2axisstr(i) for i in alias])
         else:
             raise ValueError()
         return result
@@ -136,11 +133,9 @@ class IcePAPController:
 
         :return: str
         """
-        result = ''
-        for axis, value in axes_values:
-            result += '{0} {1} '.format(self._alias2axisstr(axis),
-                                        cast_type(value))
-        return result
+        return ' '.join(['{0} {1}'.format(self._alias2axisstr(axis),
+                                          cast_type(value))
+                         for axis, value in axes_values])
 
     @classmethod
     def from_url(cls, url):
@@ -443,6 +438,19 @@ class IcePAPController:
         fstatus = self.get_fstatus(axes)
         return [State(i) for i in fstatus]
 
+    def get_moving_mask(self, axes):
+        """
+        Fast read of which axes are moving. Only the moving bit of each
+        status register is evaluated (no State objects are created).
+
+        :param axes: [str/int]
+        :return: int with bit i set if the i-th axis is moving
+        """
+        mask = 0
+        for i, status in enumerate(self.get_fstatus(axes)):
+            mask |= ((status >> State.MOVING_BIT) & 1) << i
+        return mask
+
     def get_status(self, axes):
         """
         Read of multiple status (IcePAP user manual pag. 128).
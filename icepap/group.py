@@ -1,4 +1,5 @@
 import time
+import collections
 import collections.abc
 
 from .axis import IcePAPAxis
@@ -31,6 +32,16 @@ def get_item(motors, name, default=None):
     return values
 
 
+# fields supported by Group.snapshot(): each one is read with the
+# corresponding Group.get_<field>() method
+SNAPSHOT_FIELDS = ('acctime', 'velocity', 'pos', 'fpos', 'states', 'power')
+
+# parallel columns (one value per motor) of a Group.snapshot().
+# Fields which were not requested are None
+GroupSnapshot = collections.namedtuple(
+    'GroupSnapshot', ('axes',) + SNAPSHOT_FIELDS)
+
+
 class Group:
 
     def __init__(self, motors):
@@ -41,6 +52,11 @@ class Group:
         self._controller = ctrls.pop()
         self._motors = motors
         self._names = None
+        # axis numbers are local to the motor objects (no communication)
+        # and the motors of a group never change so compute them only once
+        self.axes = [motor.axis for motor in motors]
+        # axes as they appear in multi-axis commands (ex: '?FPOS AXIS 1 2')
+        self.axes_str = ' '.join(str(axis) for axis in self.axes)
 
     @property
     def controller(self):
@@ -56,10 +72,6 @@ class Group:
             self._names = self.get_names()
         return self._names
 
-    @property
-    def axes(self):
-        return [motor.axis for motor in self.motors]
-
     def get_names(self):
         return get_item(self.motors, "name")
 
@@ -79,32 +91,59 @@ class Group:
         return get_ctrl_item(self.controller.get_states, self.axes, State(0))
 
     def is_moving(self):
-        return any(state.is_moving() for state in self.get_states())
+        try:
+            return bool(self.controller.get_moving_mask(self.axes))
+        except Exception:
+            # same as get_ctrl_item: any failure (error reply, timeout,
+            # unexpected answer) falls back to reading the states
+            states = self.get_states()
+            return any(state.is_moving() for state in states)
 
     def get_power(self):
         return get_ctrl_item(self.controller.get_power, self.axes)
 
+    def snapshot(self, *fields):
+        """
+        Read several fields of all motors. Each field is read with its
+        get_<field>() method (a single multi-axis query per field).
+
+        :param fields: field names (acctime, velocity, pos, fpos, states,
+                       power). Default is states and pos.
+        :return: GroupSnapshot
+        """
+        fields = fields or ('states', 'pos')
+        columns = dict.fromkeys(SNAPSHOT_FIELDS)
+        for field in fields:
+            columns[field] = getattr(self, 'get_' + field)()
+        return GroupSnapshot(axes=self.axes, **columns)
+
     def start_stop(self):
         self._controller.stop(self.axes)
 
     def start_move(self, positions, **kwargs):
-        args = [[mot.addr, pos] for mot, pos in zip(self._motors, positions)]
+        args = list(zip(self.axes, positions))
         self._controller.move(args, **kwargs)
 
     def start_rmove(self, positions, **kwargs):
-        args = [[mot.addr, pos] for mot, pos in zip(self._motors, positions)]
+        args = list(zip(self.axes, positions))
         self._controller.rmove(args, **kwargs)
 
-    def wait_stopped(self, timeout=None, interval=10e-3):
-        """Helper loop to wait for group to finish moving"""
+    def wait_stopped(self, timeout=None, interval=10e-3, max_interval=0.1):
+        """
+        Helper loop to wait for group to finish moving.
+
+        The states of all motors are read with a single query per poll. The
+        poll period starts at interval and doubles on each poll up to
+        max_interval so short motions are detected quickly while long
+        motions don't flood the controller with queries.
+        """
 
-        start = time.time()
+        deadline = time.monotonic() + timeout if timeout else None
         while self.is_moving():
             time.sleep(interval)
-            if timeout:
-                elapsed = time.time() - start
-                if elapsed > timeout:
-                    return False
+            interval = min(2 * interval, max(interval, max_interval))
+            if deadline is not None and time.monotonic() > deadline:
+                return False
         return True
 
 
@@ -115,7 +154,10 @@ def group(*objs):
     for obj in objs:
         if isinstance(obj, IcePAPAxis):
             motors.append(obj)
-        elif isinstance(obj, collections.abc.Sequence):
+        # check the common concrete types first: an ABC isinstance check
+        # is much slower than a plain type check
+        elif isinstance(obj, (list, tuple)) or \
+                isinstance(obj, collections.abc.Sequence):
             motors.extend(group(*obj).motors)
         else:
             motors.extend(obj.motors)
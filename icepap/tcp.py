@@ -3,6 +3,7 @@ import time
 import errno
 import select
 import socket
+import weakref
 import logging
 import functools
 
@@ -14,6 +15,9 @@ OPENING, OPEN, CLOSED = range(3)
 
 BLOCK_SIZE = 8192
 
+# maximum number of buffers in a single sendmsg call (Linux IOV_MAX)
+IOV_MAX = 1024
+
 
 ERR_MAP = {
     errno.ECONNREFUSED: ConnectionRefusedError,
@@ -39,6 +43,14 @@ def create_connection(host, port):
     return sock
 
 
+def close_socket(sock):
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    sock.close()
+
+
 def wait_open(sock, timeout=None):
     if timeout is None:
         _, w, _ = select.select((), (sock,), ())
@@ -54,37 +66,75 @@ def wait_open(sock, timeout=None):
         raise Timeout("timeout trying to connect")
 
 
-def stream(sock, buffer_size=BLOCK_SIZE, timeout=None):
-    readers = sock,
-    while True:
-        start = time.monotonic()
-        r, _, _ = select.select(readers, (), (), timeout)
-        end = time.monotonic()
+class ReadPoller:
+    """
+    Waits for a socket to become readable.
+
+    Uses a select.poll object where the socket is registered only once
+    instead of building a new fd set for every select.select() call.
+    Falls back to select.select() on systems without poll (ex: Windows).
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+        if hasattr(select, 'poll'):
+            self._poll = select.poll()
+            self._poll.register(sock, select.POLLIN)
+        else:
+            self._poll = None
+
+    def wait(self, timeout=None):
+        """
+        Wait until the socket is readable.
+
+        :param timeout: seconds (None means wait forever)
+        :return: True if readable or False on timeout
+        """
+        if self._poll is None:
+            r, _, _ = select.select((self._sock,), (), (), timeout)
+            return bool(r)
         if timeout is not None:
-            timeout -= start - end
-        if (timeout is not None and timeout <= 0) or not r:
+            # poll uses milliseconds
+            timeout = max(0, timeout * 1000)
+        return bool(self._poll.poll(timeout))
+
+    def close(self):
+        if self._poll is not None:
+            try:
+                self._poll.unregister(self._sock)
+            except (KeyError, ValueError):
+                pass
+            self._poll = None
+
+
+def stream(sock, poller, buffer, timeout=None):
+    # receives into the given (reusable) buffer and yields memoryviews on
+    # the received data: they are only valid until the next iteration
+    view = memoryview(buffer)
+    # the timeout applies to the whole stream, not to each chunk
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        if deadline is not None:
+            timeout = max(0, deadline - time.monotonic())
+        if not poller.wait(timeout):
             raise Timeout("read timeout")
-        data = sock.recv(buffer_size)
-        if not data:
+        size = sock.recv_into(view)
+        if not size:
             break
-        yield data
+        yield view[:size]
 
 
 def check_open(f):
+    # Single wrapper for the public RawTCP methods: makes sure the socket
+    # is open and closes it if the call fails. The private I/O methods are
+    # not wrapped so each call costs one extra frame and one try block only
     @functools.wraps(f)
     def wrapper(self, *args, **kwargs):
         state = self._state
-        if state is CLOSED:
-            raise to_error(errno.EBADF)
-        elif state is OPENING:
+        if state is not OPEN:
+            if state is CLOSED:
+                raise to_error(errno.EBADF)
             self.wait_open()
-        return f(self, *args, **kwargs)
-    return wrapper
-
-
-def close_on_error(f):
-    @functools.wraps(f)
-    def wrapper(self, *args, **kwargs):
         try:
             return f(self, *args, **kwargs)
         except BaseException:
@@ -98,14 +148,23 @@ class RawTCP:
     def __init__(self, host, port, eol=b"\n", timeout=None):
         self.eol = eol
         self.timeout = timeout
-        self._buffer = b""
+        self._buffer = bytearray()
+        self._recv_buffer = bytearray(BLOCK_SIZE)
         self._sock = None
+        self._poller = None
         # create a non blocking socket
         self._state = OPENING
         self._connection_time = time.monotonic()
         self._sock = create_connection(host, port)
+        # close the socket when this object is garbage collected. The
+        # finalizer only references the socket so it doesn't keep us alive
+        self._finalizer = weakref.finalize(self, close_socket, self._sock)
+        self._poller = ReadPoller(self._sock)
 
-    def __del__(self):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
         self.close()
 
     def wait_open(self):
@@ -121,7 +180,6 @@ class RawTCP:
             wait_open(self._sock, timeout=timeout)
         self._state = OPEN
 
-    @close_on_error
     def _write(self, data):
         for start in range(0, len(data), BLOCK_SIZE):
             _, w, _ = select.select((), (self._sock,), (), self.timeout)
@@ -129,14 +187,34 @@ class RawTCP:
                 raise to_error(errno.EPIPE)
             self._sock.sendall(data[start: start + BLOCK_SIZE])
 
-    @close_on_error
+    def _write_many(self, chunks):
+        if not hasattr(self._sock, "sendmsg"):
+            # ex: Windows
+            self._write(b"".join(chunks))
+            return
+        views = [memoryview(chunk).cast("B") for chunk in chunks]
+        views = [view for view in views if view.nbytes]
+        while views:
+            _, w, _ = select.select((), (self._sock,), (), self.timeout)
+            if not w:
+                raise to_error(errno.EPIPE)
+            sent = self._sock.sendmsg(views[:IOV_MAX])
+            # non blocking socket: drop what was sent and retry the rest
+            while sent:
+                size = views[0].nbytes
+                if sent < size:
+                    views[0] = views[0][sent:]
+                    break
+                sent -= size
+                views.pop(0)
+
     def _read(self, n, timeout=None):
         if self._buffer:
-            data, self._buffer = self._buffer, b""
+            data = bytes(self._buffer)
+            del self._buffer[:]
             return data
         timeout = self.timeout if timeout is None else timeout
-        r, _, _ = select.select((self._sock,), (), (), timeout)
-        if r:
+        if self._poller.wait(timeout):
             data = self._sock.recv(BLOCK_SIZE)
             if not data:
                 raise ConnectionError("remote end closed")
@@ -144,42 +222,52 @@ class RawTCP:
         else:
             raise Timeout("timeout reading from socket")
 
-    @close_on_error
     def _readline(self, eol=None, timeout=None):
         eol = self.eol if eol is None else eol
         timeout = self.timeout if timeout is None else timeout
-        data, eo, left = self._buffer.partition(eol)
-        if eo:
-            self._buffer = left
-            return data + eo
-        for data in stream(self._sock, timeout=timeout):
-            self._buffer += data
-            data, eo, left = self._buffer.partition(eol)
-            if eo:
-                self._buffer = left
-                return data + eo
-        else:
-            raise ConnectionError("remote end closed")
+        buff = self._buffer
+        index = buff.find(eol)
+        if index < 0:
+            chunks = stream(
+                self._sock, self._poller, self._recv_buffer, timeout=timeout
+            )
+            for data in chunks:
+                # don't scan again what was already scanned (except for the
+                # tail which may hold the beginning of a split eol)
+                start = max(0, len(buff) - len(eol) + 1)
+                buff.extend(data)
+                index = buff.find(eol, start)
+                if index >= 0:
+                    break
+            else:
+                raise ConnectionError("remote end closed")
+        end = index + len(eol)
+        line = bytes(buff[:end])
+        del buff[:end]
+        return line
 
     def state(self):
         return self._state
 
     def close(self):
         self._state = CLOSED
-        self._buffer = b""
+        self._buffer = bytearray()
+        if self._poller is not None:
+            self._poller.close()
+            self._poller = None
         if self._sock is not None:
-            try:
-                self._sock.shutdown(socket.SHUT_RDWR)
-                self._sock.close()
-            except OSError:
-                pass
-            finally:
-                self._sock = None
+            self._sock = None
+            # runs close_socket only once
+            self._finalizer()
 
     @check_open
     def write(self, data):
         self._write(data)
 
+    @check_open
+    def write_many(self, chunks):
+        self._write_many(chunks)
+
     @check_open
     def read(self, n, timeout=None):
         return self._read(n, timeout=timeout)
@@ -202,7 +290,11 @@ class RawTCP:
 def ensure_connection(f):
     @functools.wraps(f)
     def wrapper(self, *args, **kwargs):
-        made_connection = self._ensure_connected()
+        sock = self._sock
+        if sock is not None and sock.state() is OPEN:
+            made_connection = False
+        else:
+            made_connection = self._ensure_connected()
         try:
             return f(self, *args, **kwargs)
         except Timeout:
@@ -249,11 +341,26 @@ class TCP:
         if self._sock is not None:
             self._sock.close()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
     @ensure_connection
     def write(self, data):
         self._log.debug("write -> %r", data)
         self._sock.write(data)
 
+    @ensure_connection
+    def write_many(self, chunks):
+        """
+        Write several buffers (any bytes-like objects) in as few system
+        calls as possible (scatter write) without joining them first.
+        """
+        self._log.debug("write_many -> %d buffers", len(chunks))
+        self._sock.write_many(chunks)
+
     @ensure_connection
     def read(self, n, timeout=None):
         reply = self._sock.read(n, timeout=timeout)
@@ -262,16 +369,24 @@ class TCP:
 
     @ensure_connection
     def write_read(self, data, n, timeout=None):
-        self._log.debug("write_read -> %r", data)
+        # check the log level once for both messages
+        debug = self._log.isEnabledFor(logging.DEBUG)
+        if debug:
+            self._log.debug("write_read -> %r", data)
         reply = self._sock.write_read(data, n, timeout=timeout)
-        self._log.debug("write_read <- %r", reply)
+        if debug:
+            self._log.debug("write_read <- %r", reply)
         return reply
 
     @ensure_connection
     def write_readline(self, data, eol=None, timeout=None):
-        self._log.debug("write_readline -> %r", data)
+        # check the log level once for both messages
+        debug = self._log.isEnabledFor(logging.DEBUG)
+        if debug:
+            self._log.debug("write_readline -> %r", data)
         reply = self._sock.write_readline(data, eol=eol, timeout=timeout)
-        self._log.debug("write_readline <- %r", reply)
+        if debug:
+            self._log.debug("write_readline <- %r", reply)
         return reply
 
     @ensure_connection
@@ -8,7 +8,7 @@ import icepap.group
 
 
 @contextlib.contextmanager
-def ensure_power(obj, on=True):
+def ensure_power(obj, on=True, powers=None):
     """
     Power context manager. Entering context ensures the motor(s) have power
     (or an exception is thrown). Leaving the context leaves motor(s) has we
@@ -18,6 +18,9 @@ def ensure_power(obj, on=True):
     :param on: if True, ensures power on all motors and when leaving the
                context restores power off on the motors  that were powered
                of before. If False the reverse behavior is applied
+    :param powers: current power state of the motors, if already known
+                   (ex: from a Group.snapshot()). Avoids querying the
+                   controller. Default is None, meaning query it.
 
     Example::
 
@@ -35,7 +38,8 @@ def ensure_power(obj, on=True):
     """
     g = icepap.group.group(obj)
     ctrl = g.controller
-    powers = g.get_power()
+    if powers is None:
+        powers = g.get_power()
     to_power = [addr for addr, power in zip(g.axes, powers) if power != on]
     if to_power:
         ctrl.set_power(to_power, on)
@@ -70,20 +74,37 @@ def gen_rmove(group, target):
 
 def gen_motion(group):
     while True:
-        states, positions = group.get_states(), group.get_pos()
+        snap = group.snapshot('states', 'pos')
+        states, positions = snap.states, snap.pos
         yield states, positions
         if not is_moving(states):
             break
 
 
 def gen_rate_limiter(generator, period=0.1):
-    last_update = 0
-    for event in generator:
-        nap = period - (time.monotonic() - last_update)
+    # sleep *before* asking the generator for the next event so events are
+    # yielded as soon as they are produced. Sleeping between producing and
+    # yielding would hand out data up to one period old.
+    # The price is one extra period before noticing the generator is
+    # exhausted: consumers that can tell the last event (ex: no motor
+    # moving) should stop iterating by themselves.
+    # Events are scheduled on absolute deadlines so sleep overshoot does
+    # not accumulate. When running late, missed deadlines are skipped
+    # instead of producing a burst of events to catch up
+    generator = iter(generator)
+    deadline = time.monotonic()
+    while True:
+        nap = deadline - time.monotonic()
         if nap > 0:
             time.sleep(nap)
+        else:
+            deadline = time.monotonic()
+        deadline += period
+        try:
+            event = next(generator)
+        except StopIteration:
+            return
         yield event
-        last_update = time.monotonic()
 
 
 def interrupt_myself():
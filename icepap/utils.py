@@ -174,6 +174,9 @@ class State:
                             In OPER mode: master indexer
     ========== ============ ===============================================
     """
+    # bit of the status register set while the axis is moving
+    MOVING_BIT = 10
+
     status_meaning = {'mode': {0: Mode.OPER,
                                1: Mode.PROG,
                                2: Mode.TEST,
@@ -318,7 +321,7 @@ class State:
 
         :return: bool
         """
-        val = self._status_reg >> 10
+        val = self._status_reg >> self.MOVING_BIT
         val = val & 1
         return bool(val)
 
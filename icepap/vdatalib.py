@@ -4,7 +4,6 @@
 # #############################################################################
 
 import struct
-import numpy
 
 
 class LibDeepDeepLogMock:
@@ -184,6 +183,9 @@ class vdata:
 
     def bin(self):
         """Return an IcePAP binary compatible block"""
+        # numpy is only needed here. Importing it on demand keeps it out of
+        # the 'import icepap' startup time
+        import numpy
         return numpy.array(self._bytearray, dtype=numpy.int8)
 
     def type_to_str(self, flags):
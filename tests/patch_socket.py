@@ -65,7 +65,7 @@ def patch_socket(mock):
         '15': dict(rid='0008.020B.1028', stat='0x03 0x01', rtemp='29.5')
     }
 
-    last_send = [None]
+    pending = []
 
     def get_axis_question(cmd):
         axis, cmd = cmd.split(':?', 1)
@@ -83,8 +83,11 @@ def patch_socket(mock):
             axes_list = args[2:]
         else:
             axes_list = args[1:]
-        pos = [str(axes[axis][cmd.lower()]) for axis in axes_list]
         cmd_reply = cmd.split('_')[0]
+        if any(axis not in axes for axis in axes_list):
+            return '?{} ERROR Board is not present in the system\n'.format(
+                cmd_reply)
+        pos = [str(axes[axis][cmd.lower()]) for axis in axes_list]
         return '?{} {}\n'.format(cmd_reply, ' '.join(pos))
 
     def process_read_cmd(cmd):
@@ -167,12 +170,29 @@ def patch_socket(mock):
     def sendall(data):
         # sockets receive bytes
         cmd = data.decode(ENCODING)
-        last_send[0] = cmd
+        pending.append(cmd)
         return len(cmd)
 
+    def sendmsg(buffers):
+        data = b''.join(buffers)
+        sendall(data)
+        return len(data)
+
     def recv(size):
-        cmd = last_send[0]
-        last_send[0] = None
+        # pipelined commands are answered all together
+        cmds = pending[:]
+        del pending[:]
+        result = ''.join(process_cmd(cmd) or '' for cmd in cmds)
+
+        # sockets return bytes
+        return result.encode(ENCODING)
+
+    def recv_into(buffer, nbytes=0):
+        data = recv(nbytes or len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def process_cmd(cmd):
         cmd = cmd.upper().strip()
 
         # Position registers
@@ -181,6 +201,7 @@ def patch_socket(mock):
             cmd = cmd.replace('POS SHFTENC', 'POS_AXIS')
             cmd = cmd.replace('POS TGTENC', 'POS_AXIS')
             cmd = cmd.replace('POS CTRLENC', 'POS_AXIS')
+            cmd = cmd.replace('POS MEASURE', 'POS_AXIS')
             cmd = cmd.replace('POS ENCIN', 'POS_AXIS')
             cmd = cmd.replace('POS INPOS', 'POS_AXIS')
             cmd = cmd.replace('POS ABSENC', 'POS_AXIS')
@@ -230,13 +251,12 @@ def patch_socket(mock):
         else:
             result = process_write_cmd(cmd)
 
-        # sockets return bytes
-        return result.encode(ENCODING)
-
-        process_read_cmd()
+        return result
 
     mock.return_value.recv = recv
+    mock.return_value.recv_into = recv_into
     mock.return_value.sendall = sendall
+    mock.return_value.sendmsg = sendmsg
     mock.return_value.connect = connect
     mock.return_value.connect_ex = lambda *a: connect_ex(
         mock.socket.return_value, *a)
@@ -248,6 +268,8 @@ def patch_select(mock):
     def select(r, w, e, timeout=None):
         return r, w, e
     mock.select = select
+    # socket is always readable
+    mock.poll.return_value.poll.return_value = [(0, mock.POLLIN)]
 
 
 def select_context():
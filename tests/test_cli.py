@@ -45,3 +45,50 @@ def test_rinfo():
 └────────┴────────────────┴───────┘
 """
         assert result.output == expected
+
+
+def test_pos():
+    runner = CliRunner()
+    args = ['-u', 'icepaptest', 'pos', '--axes=1,5', '--table-style=box']
+    with mock_socket():
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0
+        expected = """\
+┌──────┬──────┬─────────┬───────┬───────┬────────┬───────┐
+│ Axis │ AXIS │ MEASURE │ ENCIN │ INPOS │ ABSENC │ MOTOR │
+├──────┼──────┼─────────┼───────┼───────┼────────┼───────┤
+│    1 │   55 │      55 │    55 │    55 │     55 │    55 │
+├──────┼──────┼─────────┼───────┼───────┼────────┼───────┤
+│    5 │   -3 │      -3 │    -3 │    -3 │     -3 │    -3 │
+└──────┴──────┴─────────┴───────┴───────┴────────┴───────┘
+"""
+        assert result.output == expected
+
+
+def test_progress_bar_reset():
+    from prompt_toolkit.input import create_pipe_input
+    from prompt_toolkit.output import DummyOutput
+    from icepap import IcePAPController
+    from icepap.group import Group
+    from icepap.cli import Motion, MotionProgressBar
+
+    with mock_socket():
+        group = Group(IcePAPController('icepaptest')[1, 5])
+        snap = group.snapshot()
+        assert group.names
+    # the progress bar runs an event loop: create it with the real sockets
+    with create_pipe_input() as inp:
+        end = [p + 10 for p in snap.pos]
+        motion = Motion(group, snap.states, snap.pos, snap.pos, end)
+        bar_options = dict(output=DummyOutput(), input=inp)
+        with MotionProgressBar(motion, bar_options=bar_options) as prog_bar:
+            prog_bar.update(snap.states, end)
+            assert [c.items_completed for c in prog_bar.counters] == [10, 10]
+            # next motion starts where the previous ended. The first update
+            # has the same states and positions (ex: motor at a limit)
+            new_end = [p + 10 for p in end]
+            prog_bar.reset(Motion(group, snap.states, end, end, new_end))
+            prog_bar.update(snap.states, end)
+            counters = prog_bar.counters
+            assert [(c.items_completed, c.total) for c in counters] == \
+                [(0, 10), (0, 10)]
@@ -1,4 +1,5 @@
 import pytest
+import unittest.mock as mock
 
 from icepap.group import Group, group
 
@@ -10,6 +11,8 @@ def test_group(smart_pap):
     assert grp.controller == m1._ctrl
     assert grp.motors == [m1, m5]
     assert grp.names == ['th', 'tth']
+    assert grp.axes == [1, 5]
+    assert grp.axes_str == '1 5'
 
     assert grp.get_pos() == [55, -3]
     assert grp.get_fpos() == [55, -3]
@@ -22,7 +25,12 @@ def test_group(smart_pap):
     grp = Group(smart_pap[1])
     assert grp.motors == [m1]
 
+    # axis 2 is not plugged: it has no name
+    grp = Group(smart_pap[1, 2])
+    assert grp.get_names() == ['th', None]
+
     grp = Group(smart_pap[1, 151])
+    assert grp.get_names() == ['th', 'chi']
     assert grp.get_power() == [True, False]
     assert grp.get_acctime() == [0.1, 0.25]
     assert grp.get_velocity() == [100, 1002]
@@ -42,3 +50,76 @@ def test_group_creation_helper(smart_pap):
     grp3 = group(smart_pap[151, 152])
     grp4 = group(grp1, m153, grp3)
     assert grp4.motors == [m1, m5, m153, m151, m152]
+
+
+def test_group_snapshot(smart_pap):
+    grp = Group(smart_pap[1, 151])
+
+    snap = grp.snapshot()
+    assert snap.axes == [1, 151]
+    # names are not needed to poll a motion: they are not read
+    assert grp._names is None
+    assert snap.pos == [55, -1000]
+    assert [s.status_register for s in snap.states] == \
+        [s.status_register for s in grp.get_states()]
+    assert snap.fpos is None
+
+    snap = grp.snapshot('fpos', 'power', 'acctime', 'velocity')
+    assert snap.fpos == [55, -1000]
+    assert snap.power == [True, False]
+    assert snap.acctime == [0.1, 0.25]
+    assert snap.velocity == [100, 1002]
+    assert snap.states is None
+
+
+def test_group_snapshot_missing_axis(smart_pap):
+    # axis 2 is not plugged: multi-axis queries fail and each field is read
+    # again axis by axis
+    grp = Group(smart_pap[1, 2])
+    snap = grp.snapshot('states', 'pos', 'power')
+    assert snap.pos == [55, None]
+    assert snap.power == [True, None]
+    assert [s.status_register for s in snap.states] == [0x00205013, 0]
+    assert grp.is_moving() is False
+
+
+def test_group_is_moving_fallback(smart_pap):
+    # any failure of the fast moving check falls back to reading the states
+    grp = Group(smart_pap[1, 5])
+    with mock.patch.object(grp.controller, 'get_moving_mask',
+                           side_effect=ValueError('bad answer')):
+        assert grp.is_moving() is False
+
+
+def test_group_wait_stopped(smart_pap):
+    grp = Group(smart_pap[1, 5])
+    assert grp.wait_stopped() is True
+
+    moving = iter([True] * 6 + [False])
+    with mock.patch.object(grp, 'is_moving', lambda: next(moving)), \
+            mock.patch('icepap.group.time.sleep') as sleep:
+        assert grp.wait_stopped(interval=0.01, max_interval=0.1) is True
+    naps = [call[0][0] for call in sleep.call_args_list]
+    assert naps == [0.01, 0.02, 0.04, 0.08, 0.1, 0.1]
+
+    clock = iter([0, 0.5, 1, 1.5, 2])
+    with mock.patch.object(grp, 'is_moving', lambda: True), \
+            mock.patch('icepap.group.time.sleep'), \
+            mock.patch('icepap.group.time.monotonic', lambda: next(clock)):
+        assert grp.wait_stopped(timeout=1) is False
+    # stopped polling as soon as the deadline passed
+    assert next(clock) == 2
+
+
+def test_group_start_move(smart_pap):
+    grp = Group(smart_pap[1, 5])
+    with mock.patch.object(grp.controller, 'send_cmd') as send_cmd:
+        grp.start_move((10, 20))
+        grp.start_rmove((-1, 2), strict=True)
+        grp.start_move((30, 40), group=False)
+    # axes come from the motors: no ?ADDR queries are sent
+    assert [call[0][0] for call in send_cmd.call_args_list] == [
+        'MOVE GROUP  1 10 5 20',
+        'RMOVE GROUP STRICT 1 -1 5 2',
+        'MOVE   1 30 5 40',
+    ]
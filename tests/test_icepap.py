@@ -210,6 +210,7 @@ def test_system(pap):
     assert pap.get_fstatus([1, 5]) == [0x00205013, 0x00205013]
 
     assert pap.get_states([1])[0].status_register == 0x00205013
+    assert pap.get_moving_mask([1, 5]) == 0
     assert [s.status_register for s in pap.get_states([1, 5])] == \
            [0x00205013, 0x00205013]
 
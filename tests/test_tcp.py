@@ -0,0 +1,88 @@
+import time
+import socket
+import threading
+
+import pytest
+
+from icepap.tcp import RawTCP, Timeout
+
+
+@pytest.fixture
+def connection():
+    """RawTCP connected to a local server. Yields (client, server side)"""
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+    client = RawTCP('127.0.0.1', server.getsockname()[1], timeout=1)
+    peer, _ = server.accept()
+    client.wait_open()
+    with server, peer, client:
+        yield client, peer
+
+
+def recv_all(sock, size):
+    data = b''
+    while len(data) < size:
+        data += sock.recv(size - len(data))
+    return data
+
+
+class PartialSendSocket:
+    """Socket whose sendmsg only sends the given number of bytes per call"""
+
+    def __init__(self, sock, sizes):
+        self._sock = sock
+        self.sizes = list(sizes)
+        self.calls = []
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def sendmsg(self, buffers):
+        self.calls.append([bytes(buff) for buff in buffers])
+        data = b''.join(buffers)[:self.sizes.pop(0)]
+        return self._sock.send(data)
+
+
+def test_write_many_partial_send(connection):
+    client, peer = connection
+    sock = client._sock
+    client._sock = PartialSendSocket(sock, [2, 5, 100])
+    try:
+        client.write_many([b'abcd', b'', b'efgh', b'ij'])
+        calls = client._sock.calls
+    finally:
+        client._sock = sock
+    # 1st call: split inside the first buffer
+    # 2nd call: split across buffers (inside the second one)
+    assert calls == [
+        [b'abcd', b'efgh', b'ij'],
+        [b'cd', b'efgh', b'ij'],
+        [b'h', b'ij'],
+    ]
+    assert recv_all(peer, 10) == b'abcdefghij'
+
+
+def test_readline_timeout_trickle(connection):
+    client, peer = connection
+    stop = threading.Event()
+
+    def trickle():
+        peer.sendall(b'partial')
+        # keep sending bytes (never the eol) until well after the timeout
+        end = time.monotonic() + 1
+        while not stop.wait(0.02) and time.monotonic() < end:
+            peer.sendall(b'x')
+
+    thread = threading.Thread(target=trickle)
+    thread.start()
+    start = time.monotonic()
+    try:
+        with pytest.raises(Timeout):
+            client.readline(timeout=0.2)
+    finally:
+        elapsed = time.monotonic() - start
+        stop.set()
+        thread.join()
+    # the timeout applies to the whole line, not to each chunk
+    assert elapsed < 0.5
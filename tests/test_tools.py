@@ -0,0 +1,11 @@
+import time
+
+from icepap.tools import gen_rate_limiter
+
+
+def test_gen_rate_limiter():
+    start = time.monotonic()
+    assert list(gen_rate_limiter([1, 2, 3], period=0.01)) == [1, 2, 3]
+    assert time.monotonic() - start >= 0.03
+
+    assert list(gen_rate_limiter(iter(()), period=0)) == []